@@ -1,237 +1,426 @@
-#!/usr/bin/env python3
-"""
-Student Finance Manager
-Simple CLI app to track incomes/expenses per student, with JSON persistence.
-"""
-
-import json
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import List, Dict, Optional
-
-DATA_FILE = "students_finance.json"
-DATE_FMT = "%Y-%m-%d"  # ISO-like date format
-
-
-@dataclass
-class Transaction:
-    ttype: str        # "income" or "expense"
-    amount: float
-    description: str
-    date: str         # YYYY-MM-DD
-
-    def to_dict(self):
-        return asdict(self)
-
-
-@dataclass
-class Student:
-    student_id: str
-    name: str
-    transactions: List[Transaction]
-
-    def to_dict(self):
-        return {
-            "student_id": self.student_id,
-            "name": self.name,
-            "transactions": [t.to_dict() for t in self.transactions]
-        }
-
-    def balance(self) -> float:
-        bal = 0.0
-        for t in self.transactions:
-            if t.ttype == "income":
-                bal += t.amount
-            else:
-                bal -= t.amount
-        return bal
-
-
-class FinanceManager:
-    def __init__(self):
-        self.students: Dict[str, Student] = {}
-
-    # Student management
-    def add_student(self, student_id: str, name: str) -> bool:
-        if student_id in self.students:
-            return False
-        self.students[student_id] = Student(student_id=student_id, name=name, transactions=[])
-        return True
-
-    def remove_student(self, student_id: str) -> bool:
-        return (self.students.pop(student_id, None) is not None)
-
-    def find_student(self, student_id: str) -> Optional[Student]:
-        return self.students.get(student_id)
-
-    # Transactions
-    def record_transaction(self, student_id: str, ttype: str, amount: float, description: str, date: Optional[str] = None) -> bool:
-        student = self.find_student(student_id)
-        if not student:
-            return False
-        if ttype not in ("income", "expense"):
-            return False
-        if date is None:
-            date = datetime.now().strftime(DATE_FMT)
-        tx = Transaction(ttype=ttype, amount=round(amount, 2), description=description, date=date)
-        student.transactions.append(tx)
-        return True
-
-    # Reports
-    def student_report(self, student_id: str) -> Optional[Dict]:
-        student = self.find_student(student_id)
-        if not student:
-            return None
-        return {
-            "student_id": student.student_id,
-            "name": student.name,
-            "balance": round(student.balance(), 2),
-            "transactions": [t.to_dict() for t in student.transactions]
-        }
-
-    def all_students_summary(self) -> List[Dict]:
-        out = []
-        for s in self.students.values():
-            out.append({
-                "student_id": s.student_id,
-                "name": s.name,
-                "balance": round(s.balance(), 2),
-                "num_transactions": len(s.transactions)
-            })
-        return out
-
-    # Persistence
-    def save(self, filename: str = DATA_FILE) -> None:
-        data = {"students": [s.to_dict() for s in self.students.values()]}
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        print(f"Saved data to {filename}.")
-
-    def load(self, filename: str = DATA_FILE) -> bool:
-        try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.students = {}
-            for s in data.get("students", []):
-                transactions = [Transaction(**t) for t in s.get("transactions", [])]
-                student = Student(student_id=s["student_id"], name=s["name"], transactions=transactions)
-                self.students[student.student_id] = student
-            print(f"Loaded data from {filename}.")
-            return True
-        except FileNotFoundError:
-            print(f"No data file found at {filename}. Starting fresh.")
-            return False
-        except Exception as e:
-            print("Failed to load data:", e)
-            return False
-
-
-def main_menu():
-    print("\n=== Student Finance Manager ===")
-    print("1. Add student")
-    print("2. Remove student")
-    print("3. Record income")
-    print("4. Record expense")
-    print("5. Show student report")
-    print("6. List all students (summary)")
-    print("7. Save data")
-    print("8. Load data")
-    print("9. Exit")
-    print("===============================")
-
-
-def input_nonempty(prompt: str) -> str:
-    while True:
-        s = input(prompt).strip()
-        if s:
-            return s
-        print("Please enter a non-empty value.")
-
-
-def run_cli():
-    fm = FinanceManager()
-    fm.load()  # attempt to load existing data on start
-
-    while True:
-        main_menu()
-        choice = input("Enter choice: ").strip()
-        if choice == "1":
-            sid = input_nonempty("Student ID (unique): ")
-            name = input_nonempty("Student name: ")
-            if fm.add_student(sid, name):
-                print("Student added.")
-            else:
-                print("Student ID already exists.")
-        elif choice == "2":
-            sid = input_nonempty("Student ID to remove: ")
-            if fm.remove_student(sid):
-                print("Student removed.")
-            else:
-                print("Student not found.")
-        elif choice == "3" or choice == "4":
-            sid = input_nonempty("Student ID: ")
-            student = fm.find_student(sid)
-            if not student:
-                print("Student not found.")
-                continue
-            try:
-                amount_str = input_nonempty("Amount: ")
-                amount = float(amount_str)
-            except ValueError:
-                print("Invalid amount. Use numbers like 1500.50")
-                continue
-            desc = input("Description (optional): ").strip() or ("Income" if choice == "3" else "Expense")
-            # allow custom date or default today
-            date_input = input("Date (YYYY-MM-DD) [leave empty for today]: ").strip()
-            if date_input:
-                try:
-                    datetime.strptime(date_input, DATE_FMT)
-                    date = date_input
-                except ValueError:
-                    print("Invalid date format; using today's date.")
-                    date = datetime.now().strftime(DATE_FMT)
-            else:
-                date = None
-            ttype = "income" if choice == "3" else "expense"
-            if fm.record_transaction(sid, ttype, amount, desc, date):
-                print(f"{ttype.title()} recorded.")
-            else:
-                print("Failed to record transaction.")
-        elif choice == "5":
-            sid = input_nonempty("Student ID: ")
-            report = fm.student_report(sid)
-            if not report:
-                print("Student not found.")
-                continue
-            print("\n--- Student Report ---")
-            print(f"ID: {report['student_id']}\nName: {report['name']}\nBalance: {report['balance']:.2f}")
-            print("Transactions:")
-            if not report["transactions"]:
-                print("  (no transactions)")
-            else:
-                for i, t in enumerate(report["transactions"], 1):
-                    sign = "+" if t["ttype"] == "income" else "-"
-                    print(f" {i}. [{t['date']}] {t['ttype'].title():7} {sign}{t['amount']:.2f} — {t['description']}")
-        elif choice == "6":
-            summary = fm.all_students_summary()
-            if not summary:
-                print("No students.")
-            else:
-                print("\nStudents summary:")
-                for s in summary:
-                    print(f" - {s['student_id']}: {s['name']} | Balance: {s['balance']:.2f} | Tx: {s['num_transactions']}")
-        elif choice == "7":
-            fm.save()
-        elif choice == "8":
-            fm.load()
-        elif choice == "9":
-            print("Saving before exit...")
-            fm.save()
-            print("Goodbye.")
-            break
-        else:
-            print("Invalid choice. Pick 1-9.")
-
-
-if __name__ == "__main__":
-    run_cli()
+#!/usr/bin/env python3
+"""
+Student Finance Manager
+Simple CLI app to track incomes/expenses per student, with JSON persistence.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+try:
+    import orjson  # optional: much faster JSON encode/decode
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # optional: vectorized balance recomputation
+except ImportError:
+    np = None
+
+try:
+    from numba import njit  # optional: JIT-compiled summation kernel
+except ImportError:
+    njit = None
+from datetime import datetime
+from typing import List, Dict, Optional
+
+DATA_FILE = "students_finance.json"
+LOG_FILE = "students.jsonl"  # append-only event log, compacted into DATA_FILE on save
+LOG_COMPACT_THRESHOLD = 10_000  # events in the log before a save() is forced
+PARALLEL_LOAD_THRESHOLD = 10_000  # students in a file before load() uses a process pool
+REPORT_CACHE_THRESHOLD = 1_000  # transactions before report_mode caches a student's report
+DATE_FMT = "%Y-%m-%d"  # ISO-like date format
+
+# interned so loaded ttype comparisons hit the identity fast path
+INCOME = sys.intern("income")
+EXPENSE = sys.intern("expense")
+
+# precomputed render fragments for the report loop (titles padded to width 7)
+_TTYPE_TITLE = {INCOME: "Income ", EXPENSE: "Expense"}
+_SIGN = {INCOME: "+", EXPENSE: "-"}
+
+
+@lru_cache(maxsize=4)
+def _today_cached(sec: int) -> str:
+    """Today's date string, memoized per second for bulk inserts."""
+    return datetime.fromtimestamp(sec).strftime(DATE_FMT)
+
+
+@dataclass(slots=True)
+class Transaction:
+    ttype: str        # "income" or "expense"
+    amount_cents: int  # amount in integer cents; exact, no FP rounding
+    description: str
+    date: str         # YYYY-MM-DD
+    signed_cents: int = field(init=False, default=0)  # +cents/-cents, fixed at creation
+
+    def __post_init__(self):
+        self.signed_cents = self.amount_cents if self.ttype == "income" else -self.amount_cents
+
+    def to_dict(self):
+        # signed_cents is derived and deliberately left out of the JSON schema
+        return {
+            "ttype": self.ttype,
+            "amount_cents": self.amount_cents,
+            "description": self.description,
+            "date": self.date
+        }
+
+
+@dataclass(slots=True)
+class Student:
+    student_id: str
+    name: str
+    transactions: List[Transaction]
+    _balance_cents: int = 0  # running balance in cents, kept in sync by record_transaction
+    _report_cache: Optional[Dict] = None  # memoized student_report payload (report mode only)
+
+    def to_dict(self):
+        return {
+            "student_id": self.student_id,
+            "name": self.name,
+            "transactions": [t.to_dict() for t in self.transactions]
+        }
+
+    def balance(self) -> float:
+        return self._balance_cents / 100
+
+
+def _sum_signed(amounts) -> float:
+    acc = 0.0
+    for i in range(len(amounts)):
+        acc += amounts[i]
+    return acc
+
+
+if njit is not None and np is not None:
+    _sum_signed = njit(cache=True, fastmath=True)(_sum_signed)
+    # trigger the one-time compile at import so the first load() isn't charged
+    _sum_signed(np.zeros(1, dtype=np.int64))
+
+
+def _recompute_balance(transactions: List[Transaction]) -> int:
+    """Sum pre-signed cents in one pass over a columnar array. Exact."""
+    n = len(transactions)
+    if np is not None and n:
+        signed = np.fromiter((t.signed_cents for t in transactions), dtype=np.int64, count=n)
+        if njit is not None:
+            return int(_sum_signed(signed))
+        return int(signed.sum())
+    return sum(t.signed_cents for t in transactions)
+
+
+def _intern_desc(desc: str) -> str:
+    # short descriptions repeat a lot ("Income", "Rent", ...); long ones rarely do
+    return sys.intern(desc) if len(desc) <= 32 else desc
+
+
+def _tx_cents(t: Dict) -> int:
+    # current schema stores integer cents; legacy files stored a float "amount"
+    if "amount_cents" in t:
+        return t["amount_cents"]
+    return int(round(t["amount"] * 100))
+
+
+def _build_student(s: Dict) -> Student:
+    """Construct a Student (with recomputed balance) from its decoded dict."""
+    transactions = [
+        Transaction(sys.intern(t["ttype"]), _tx_cents(t), _intern_desc(t["description"]), t["date"])
+        for t in s.get("transactions", [])
+    ]
+    student = Student(student_id=s["student_id"], name=s["name"], transactions=transactions)
+    student._balance_cents = _recompute_balance(transactions)
+    return student
+
+
+class FinanceManager:
+    def __init__(self):
+        self.students: Dict[str, Student] = {}
+        self._log = None  # lazily opened append handle for LOG_FILE
+        self._log_events = 0  # lines in the log since the last compaction
+        self._replaying = False  # suppress logging while replaying the log
+        self.report_mode = False  # read-mostly mode: memoize per-student reports
+
+    # Event log (write-ahead): each mutation appends one JSON line, so a
+    # single transaction costs O(1) I/O instead of rewriting the whole state.
+    def _append_event(self, event: Dict) -> None:
+        if self._replaying:
+            return
+        if self._log is None:
+            self._log = open(LOG_FILE, "ab", buffering=1 << 16)
+        if orjson is not None:
+            line = orjson.dumps(event)
+        else:
+            line = json.dumps(event, ensure_ascii=False).encode("utf-8")
+        self._log.write(line + b"\n")
+        self._log.flush()
+        self._log_events += 1
+        if self._log_events >= LOG_COMPACT_THRESHOLD:
+            self.save()
+
+    def _replay_log(self) -> None:
+        try:
+            with open(LOG_FILE, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+        good = 0  # bytes of the log that replayed cleanly
+        events = 0
+        self._replaying = True
+        try:
+            for line in raw.splitlines(keepends=True):
+                stripped = line.strip()
+                if stripped:
+                    try:
+                        ev = orjson.loads(stripped) if orjson is not None else json.loads(stripped)
+                    except ValueError:
+                        # torn tail from a crash mid-append: keep the good prefix
+                        print("Event log ends in a partial line; discarding it.")
+                        break
+                    op = ev.get("op")
+                    if op == "add":
+                        self.add_student(ev["sid"], ev["name"])
+                    elif op == "del":
+                        self.remove_student(ev["sid"])
+                    elif op == "tx":
+                        amount = ev["amount_cents"] / 100 if "amount_cents" in ev else ev["amount"]
+                        self.record_transaction(ev["sid"], ev["ttype"], amount,
+                                                ev["description"], ev["date"])
+                    events += 1
+                good += len(line)
+        finally:
+            self._replaying = False
+        if good < len(raw):
+            # drop the malformed tail so future appends start from a clean line
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            with open(LOG_FILE, "r+b") as f:
+                f.truncate(good)
+        self._log_events = events
+
+    def _truncate_log(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        try:
+            os.remove(LOG_FILE)
+        except FileNotFoundError:
+            pass
+        self._log_events = 0
+
+    # Student management
+    def add_student(self, student_id: str, name: str) -> bool:
+        if student_id in self.students:
+            return False
+        self.students[student_id] = Student(student_id=student_id, name=name, transactions=[])
+        self._append_event({"op": "add", "sid": student_id, "name": name})
+        return True
+
+    def remove_student(self, student_id: str) -> bool:
+        if self.students.pop(student_id, None) is None:
+            return False
+        self._append_event({"op": "del", "sid": student_id})
+        return True
+
+    def find_student(self, student_id: str) -> Optional[Student]:
+        return self.students.get(student_id)
+
+    # Transactions
+    def record_transaction(self, student_id: str, ttype: str, amount: float, description: str, date: Optional[str] = None) -> bool:
+        student = self.find_student(student_id)
+        if not student:
+            return False
+        if ttype not in ("income", "expense"):
+            return False
+        if date is None:
+            date = _today_cached(int(time.time()))
+        tx = Transaction(ttype=ttype, amount_cents=int(round(amount * 100)),
+                         description=description, date=date)
+        student.transactions.append(tx)
+        student._balance_cents += tx.signed_cents
+        student._report_cache = None  # stale once a transaction lands
+        self._append_event({"op": "tx", "sid": student_id, "ttype": ttype,
+                            "amount_cents": tx.amount_cents, "description": description, "date": date})
+        return True
+
+    # Reports
+    def student_report(self, student_id: str) -> Optional[Dict]:
+        student = self.find_student(student_id)
+        if not student:
+            return None
+        if self.report_mode and student._report_cache is not None:
+            return student._report_cache
+        report = {
+            "student_id": student.student_id,
+            "name": student.name,
+            "balance": student.balance(),  # exact: integer cents / 100
+            "transactions": [t.to_dict() for t in student.transactions]
+        }
+        if self.report_mode and len(student.transactions) >= REPORT_CACHE_THRESHOLD:
+            student._report_cache = report
+        return report
+
+    def iter_all_students_summary(self):
+        """Yield (student_id, name, balance, num_transactions) per student."""
+        for s in self.students.values():
+            yield s.student_id, s.name, s.balance(), len(s.transactions)
+
+    # Persistence
+    def save(self, filename: str = DATA_FILE) -> None:
+        data = {"students": [s.to_dict() for s in self.students.values()]}
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        tmp = filename + ".tmp"
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)  # atomic: readers see old or new file, never partial
+        self._truncate_log()  # snapshot now covers everything in the log
+        print(f"Saved data to {filename}.")
+
+    def load(self, filename: str = DATA_FILE) -> bool:
+        try:
+            with open(filename, "rb", buffering=1 << 20) as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            raw_students = data.get("students", [])
+            if len(raw_students) > PARALLEL_LOAD_THRESHOLD:
+                # object construction is pure CPU; fan it out across cores
+                with ProcessPoolExecutor() as ex:
+                    built = ex.map(_build_student, raw_students, chunksize=256)
+                    self.students = {st.student_id: st for st in built}
+            else:
+                self.students = {s["student_id"]: _build_student(s) for s in raw_students}
+            print(f"Loaded data from {filename}.")
+            loaded = True
+        except FileNotFoundError:
+            print(f"No data file found at {filename}. Starting fresh.")
+            self.students = {}  # replay must start from empty, not whatever is in memory
+            loaded = False
+        except Exception as e:
+            print("Failed to load data:", e)
+            return False
+        try:
+            self._replay_log()
+        except Exception as e:
+            print("Failed to replay event log:", e)
+        return loaded
+
+
+def main_menu():
+    print("\n=== Student Finance Manager ===")
+    print("1. Add student")
+    print("2. Remove student")
+    print("3. Record income")
+    print("4. Record expense")
+    print("5. Show student report")
+    print("6. List all students (summary)")
+    print("7. Save data")
+    print("8. Load data")
+    print("9. Exit")
+    print("===============================")
+
+
+def input_nonempty(prompt: str) -> str:
+    while True:
+        s = input(prompt).strip()
+        if s:
+            return s
+        print("Please enter a non-empty value.")
+
+
+def run_cli():
+    fm = FinanceManager()
+    fm.load()  # attempt to load existing data on start
+
+    while True:
+        main_menu()
+        choice = input("Enter choice: ").strip()
+        if choice == "1":
+            sid = input_nonempty("Student ID (unique): ")
+            name = input_nonempty("Student name: ")
+            if fm.add_student(sid, name):
+                print("Student added.")
+            else:
+                print("Student ID already exists.")
+        elif choice == "2":
+            sid = input_nonempty("Student ID to remove: ")
+            if fm.remove_student(sid):
+                print("Student removed.")
+            else:
+                print("Student not found.")
+        elif choice == "3" or choice == "4":
+            sid = input_nonempty("Student ID: ")
+            student = fm.find_student(sid)
+            if not student:
+                print("Student not found.")
+                continue
+            try:
+                amount_str = input_nonempty("Amount: ")
+                amount = float(amount_str)
+            except ValueError:
+                print("Invalid amount. Use numbers like 1500.50")
+                continue
+            desc = input("Description (optional): ").strip() or ("Income" if choice == "3" else "Expense")
+            # allow custom date or default today
+            date_input = input("Date (YYYY-MM-DD) [leave empty for today]: ").strip()
+            if date_input:
+                try:
+                    datetime.strptime(date_input, DATE_FMT)
+                    date = date_input
+                except ValueError:
+                    print("Invalid date format; using today's date.")
+                    date = datetime.now().strftime(DATE_FMT)
+            else:
+                date = None
+            ttype = "income" if choice == "3" else "expense"
+            if fm.record_transaction(sid, ttype, amount, desc, date):
+                print(f"{ttype.title()} recorded.")
+            else:
+                print("Failed to record transaction.")
+        elif choice == "5":
+            sid = input_nonempty("Student ID: ")
+            report = fm.student_report(sid)
+            if not report:
+                print("Student not found.")
+                continue
+            print("\n--- Student Report ---")
+            print(f"ID: {report['student_id']}\nName: {report['name']}\nBalance: {report['balance']:.2f}")
+            print("Transactions:")
+            if not report["transactions"]:
+                print("  (no transactions)")
+            else:
+                for i, t in enumerate(report["transactions"], 1):
+                    tt = t["ttype"]
+                    print(f" {i}. [{t['date']}] {_TTYPE_TITLE[tt]} {_SIGN[tt]}{t['amount_cents'] / 100:.2f} — {t['description']}")
+        elif choice == "6":
+            if not fm.students:
+                print("No students.")
+            else:
+                print("\nStudents summary:")
+                for sid, name, balance, ntx in fm.iter_all_students_summary():
+                    print(f" - {sid}: {name} | Balance: {balance:.2f} | Tx: {ntx}")
+        elif choice == "7":
+            fm.save()
+        elif choice == "8":
+            fm.load()
+        elif choice == "9":
+            print("Saving before exit...")
+            fm.save()
+            print("Goodbye.")
+            break
+        else:
+            print("Invalid choice. Pick 1-9.")
+
+
+if __name__ == "__main__":
+    run_cli()